@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""Numba kernels for formatting the edge block of a Pajek file as ASCII bytes
+
+numba is optional. If it is not installed, ``HAS_NUMBA`` is False and the
+writer falls back to its pandas string formatting.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+    prange = range
+
+
+@njit(cache=True)
+def _count_digits(x):
+    n = 1
+    while x >= 10:
+        x //= 10
+        n += 1
+    return n
+
+
+@njit(cache=True)
+def _write_digits(out, pos, x, ndigits):
+    for k in range(ndigits - 1, -1, -1):
+        out[pos + k] = 48 + x % 10  # ord("0") == 48
+        x //= 10
+
+
+@njit(parallel=True, cache=True)
+def _line_lengths(citing, cited):
+    lengths = np.empty(len(citing), dtype=np.int64)
+    for i in prange(len(citing)):
+        # "<citing> <cited>\n"
+        lengths[i] = _count_digits(citing[i]) + _count_digits(cited[i]) + 2
+    return lengths
+
+
+@njit(parallel=True, cache=True)
+def _fill_lines(citing, cited, offsets, out):
+    for i in prange(len(citing)):
+        pos = offsets[i]
+        ndigits = _count_digits(citing[i])
+        _write_digits(out, pos, citing[i], ndigits)
+        pos += ndigits
+        out[pos] = 32  # ord(" ")
+        pos += 1
+        ndigits = _count_digits(cited[i])
+        _write_digits(out, pos, cited[i], ndigits)
+        pos += ndigits
+        out[pos] = 10  # ord("\n")
+
+
+def format_edge_lines(citing, cited):
+    """Format "<citing> <cited>" lines for arrays of positive integer node IDs
+
+    Parameters
+    ----------
+    citing : array of int
+    cited : array of int
+
+    Returns
+    -------
+    numpy uint8 array of the ASCII-encoded lines, ready to be written to a
+    binary file
+
+    """
+    citing = np.ascontiguousarray(citing, dtype=np.int64)
+    cited = np.ascontiguousarray(cited, dtype=np.int64)
+    if len(citing) and min(citing.min(), cited.min()) < 1:
+        raise ValueError("node IDs must be positive integers")
+    lengths = _line_lengths(citing, cited)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    out = np.empty(offsets[-1], dtype=np.uint8)
+    _fill_lines(citing, cited, offsets, out)
+    return out
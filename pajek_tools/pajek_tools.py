@@ -2,33 +2,19 @@
 
 DESCRIPTION = """Pajek Tools"""
 
-import sys, os, time, gc
-from pathlib import Path
-from typing import Optional
-from datetime import datetime
-from timeit import default_timer as timer
-
-try:
-    from humanfriendly import format_timespan
-except ImportError:
-
-    def format_timespan(seconds):
-        return "{:.2f} seconds".format(seconds)
-
+import warnings
+from typing import Optional, Union
 
 import logging
 
-# logging.basicConfig(format='%(asctime)s %(name)s.%(lineno)d %(levelname)s : %(message)s',
-#         datefmt="%H:%M:%S",
-#         level=logging.INFO)
-# logger = logging.getLogger(__name__)
-# logger = logging.getLogger('__main__').getChild(__name__)
 logger = logging.getLogger(__name__)
-# logger.addHandler(logging.NullHandler())
 
 import pandas as pd
 import numpy as np
-from csv import QUOTE_NONE
+
+# buffer size for the output file. writes of many short lines are much cheaper
+# with a large buffer than with the default (~8KB)
+WRITE_BUFFER_SIZE = 1 << 20
 
 
 class PajekWriter:
@@ -45,7 +31,8 @@ class PajekWriter:
         citing_colname: str = "ID",
         cited_colname: str = "cited_ID",
         weight_colname: str = "weight",
-        dtype: str = "str",
+        dtype: Union[str, np.dtype, None] = None,
+        sort_vertices: bool = False,
     ):
         """
 
@@ -69,8 +56,18 @@ class PajekWriter:
             Column label for the cited node name
         weight_colname : `str`, default: "weight"
             Column label for the edge weight, if this is a weighted network
-        dtype: 'str', default: "str"
-            Data type for the citing/cited ID columns
+        dtype : `str` or numpy dtype, optional
+            Data type for the citing/cited ID columns. If None, columns with a
+            numpy integer dtype are kept as integers (self.dtype is then set
+            to their common numpy integer dtype), and anything else is cast to
+            "str". If "category", both columns are converted to categoricals
+            sharing the same categories, so that repeated node names are
+            stored only once and the vertices can be read straight off the
+            categories.
+        sort_vertices : `bool`, default: False
+            Assign node IDs in sorted order of node name. Pajek does not need
+            this, so by default node IDs follow order of first appearance in
+            the edgelist, which avoids a sort.
 
         """
         self.df_edgelist = edgelist
@@ -88,15 +85,90 @@ class PajekWriter:
         self.cited_colname = cited_colname
         self.weight_colname = weight_colname
         self.dtype = dtype
-
-        self.df_edgelist[citing_colname] = self.df_edgelist[citing_colname].astype(self.dtype)
-        self.df_edgelist[cited_colname] = self.df_edgelist[cited_colname].astype(self.dtype)
+        self.sort_vertices = sort_vertices
+        self.parquet_file = None
+        self.parquet_batch_size = None
+        self.parquet_vertices = None
+
+        if self.df_edgelist is not None:
+            # check before any cast, since astype(str) turns NA into "nan" etc.
+            self._check_no_missing_ids()
+
+        if self.df_edgelist is None:
+            # edges will be read from somewhere else (see from_parquet())
+            pass
+        elif self.dtype is None and self._has_integer_ids():
+            # integer IDs are much cheaper to factorize and write than strings,
+            # so keep them as they are
+            citing_dtype = self.df_edgelist[citing_colname].dtype
+            cited_dtype = self.df_edgelist[cited_colname].dtype
+            self.dtype = np.result_type(citing_dtype, cited_dtype)
+            if self.dtype.kind not in "iu":
+                # e.g., uint64 and int64, which would have to become float64
+                raise TypeError(
+                    "citing and cited ID columns ({}, {}) have no common "
+                    "integer dtype".format(citing_dtype, cited_dtype)
+                )
+            for colname in (citing_colname, cited_colname):
+                if self.df_edgelist[colname].dtype != self.dtype:
+                    self.df_edgelist[colname] = self.df_edgelist[colname].astype(
+                        self.dtype
+                    )
+        elif self.dtype == "category":
+            self._set_shared_categories()
+        else:
+            if self.dtype is None:
+                self.dtype = "str"
+            for colname in (citing_colname, cited_colname):
+                # skip the cast (and the full-column copy) if it's a no-op
+                if not self._has_dtype(self.df_edgelist[colname]):
+                    self.df_edgelist[colname] = self.df_edgelist[colname].astype(
+                        self.dtype, copy=False
+                    )
 
         self.df_vertices = None
-        self.id_map = None
 
         logger.debug("PajekWriter initialized")
 
+    @classmethod
+    def from_parquet(cls, path, batch_size: int = 10000000, **kwargs):
+        """Create a PajekWriter that streams the edgelist from a parquet file
+
+        The edges are read in record batches with pyarrow and are never
+        loaded into a pandas dataframe, which avoids boxing string node
+        names as python objects. Requires pyarrow.
+
+        Parameters
+        ----------
+        path : str or Path
+            path to the parquet edgelist
+        batch_size : int, default: 10000000
+            number of rows per record batch when reading the parquet file.
+            Looking up a batch's node IDs rebuilds a hash set of all of the
+            vertices, so batches should be large. This is independent of the
+            chunksize passed to write()
+        **kwargs
+            passed to PajekWriter (e.g., citing_colname, cited_colname).
+            dtype is not accepted: the column types in the parquet file are
+            used as they are
+
+        Returns
+        -------
+        PajekWriter
+
+        """
+        if "dtype" in kwargs:
+            raise TypeError("from_parquet() does not take a dtype argument")
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("You need to install pyarrow for this")
+        writer = cls(None, **kwargs)
+        writer.parquet_file = pq.ParquetFile(path)
+        writer.parquet_batch_size = batch_size
+        writer.num_edges = writer.parquet_file.metadata.num_rows
+        return writer
+
     @property
     def df_edgelist(self):
         """
@@ -111,29 +183,229 @@ class PajekWriter:
     @df_edgelist.setter
     def df_edgelist(self, value):
         self._df_edgelist = value
+        self.edge_ids = None
         if self._df_edgelist is not None:
             self.num_edges = len(self.df_edgelist)
 
     @property
     def df_vertices(self):
-        """dataframe of unique node names and assigned integer node IDs"""
+        """dataframe of unique node names and assigned integer node IDs
+
+        Only built (from self.vertex_names and self.vertex_ids) when accessed;
+        writing the network does not need it.
+
+        """
+        if self._df_vertices is None and self.vertex_names is not None:
+            self._df_vertices = pd.DataFrame(
+                {"node_name": self.vertex_names, "node_id": self.vertex_ids}
+            )
         return self._df_vertices
 
     @df_vertices.setter
     def df_vertices(self, value):
+        if value is None:
+            self._set_vertices(None, None)
+        else:
+            self._set_vertices(
+                value["node_name"].to_numpy(), value["node_id"].to_numpy()
+            )
         self._df_vertices = value
-        if self._df_vertices is not None:
-            self.num_vertices = len(self.df_vertices)
+
+    def _set_vertices(self, names, ids):
+        """Set the node name and node ID arrays, resetting anything derived from them"""
+        self.vertex_names = names
+        self.vertex_ids = ids
+        self._df_vertices = None
+        self._vertex_index = None
+        self.parquet_vertices = None
+        self.edge_ids = None
+        self.id_map = None
+        if names is not None:
+            self.num_vertices = len(names)
+
+    def _get_vertex_index(self):
+        """Get a pandas Index of the vertex names, built once and reused for lookups"""
+        if self._vertex_index is None:
+            self._vertex_index = pd.Index(self.vertex_names)
+        return self._vertex_index
+
+    def _check_no_missing_ids(self):
+        """Raise a ValueError if the citing or cited column has missing values"""
+        for colname in (self.citing_colname, self.cited_colname):
+            if self.df_edgelist[colname].isna().any():
+                raise ValueError("citing/cited ID columns contain missing values")
+
+    def _has_dtype(self, col):
+        """Check whether casting a column to self.dtype would leave it unchanged"""
+        if self.dtype == "str" and col.dtype == object:
+            # astype(str) gives an object column, which only changes anything
+            # if some of the values aren't already strings
+            return pd.api.types.infer_dtype(col, skipna=False) == "string"
+        return col.dtype == self.dtype
+
+    def _has_integer_ids(self):
+        """Check whether both the citing and cited columns have a numpy integer dtype
+
+        Nullable (extension) integer dtypes don't count, since they may hold NA.
+
+        """
+        return all(
+            isinstance(self.df_edgelist[colname].dtype, np.dtype)
+            and self.df_edgelist[colname].dtype.kind in "iu"
+            for colname in (self.citing_colname, self.cited_colname)
+        )
+
+    def _check_vertex_names_dtype(self):
+        """Make sure supplied vertex names can match the edge ID columns"""
+        edge_dtype = self.df_edgelist[self.citing_colname].dtype
+        if isinstance(edge_dtype, pd.CategoricalDtype):
+            edge_dtype = edge_dtype.categories.dtype
+        if pd.api.types.is_integer_dtype(edge_dtype) != pd.api.types.is_integer_dtype(
+            self.vertex_names
+        ):
+            raise TypeError(
+                "df_vertices node_name dtype ({}) does not match the dtype of the "
+                "citing/cited ID columns ({})".format(
+                    self.vertex_names.dtype, edge_dtype
+                )
+            )
+
+    def _set_shared_categories(self):
+        """Convert the citing/cited columns to categoricals with one shared set of categories"""
+        codes, uniques = pd.factorize(
+            pd.concat(
+                (
+                    self.df_edgelist[self.citing_colname],
+                    self.df_edgelist[self.cited_colname],
+                ),
+                ignore_index=True,
+            ),
+            sort=self.sort_vertices,
+        )
+        if (codes == -1).any():
+            raise ValueError("citing/cited ID columns contain missing values")
+        cat_dtype = pd.CategoricalDtype(uniques)
+        self.df_edgelist[self.citing_colname] = pd.Categorical.from_codes(
+            codes[: self.num_edges], dtype=cat_dtype
+        )
+        self.df_edgelist[self.cited_colname] = pd.Categorical.from_codes(
+            codes[self.num_edges :], dtype=cat_dtype
+        )
+
+    def _get_vertices_parquet(self):
+        """Get the vertex arrays from a parquet edgelist, using pyarrow"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        uniques = []
+        for batch in self.parquet_file.iter_batches(
+            batch_size=self.parquet_batch_size,
+            columns=[self.citing_colname, self.cited_colname],
+        ):
+            citing, cited = batch.column(0), batch.column(1)
+            if citing.null_count or cited.null_count:
+                raise ValueError("citing/cited ID columns contain missing values")
+            uniques.append(
+                pc.unique(pa.chunked_array([citing, cited.cast(citing.type)]))
+            )
+        vertices = pc.unique(pa.chunked_array(uniques))
+        if self.sort_vertices:
+            vertices = vertices.take(pc.sort_indices(vertices))
+        self._set_vertices(
+            vertices.to_numpy(zero_copy_only=False), np.arange(1, len(vertices) + 1)
+        )
+        self.parquet_vertices = vertices
+        return self.vertex_names, self.vertex_ids
+
+    def _write_edges_parquet(self, outfile):
+        """Write the edge lines for a parquet edgelist, one record batch at a time"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pacsv
+
+        columns = [self.citing_colname, self.cited_colname]
+        if self.weighted:
+            columns.append(self.weight_colname)
+        write_options = pacsv.WriteOptions(include_header=False, delimiter=" ")
+        if self.parquet_vertices is None:
+            # df_vertices was supplied by the caller
+            field_type = self.parquet_file.schema_arrow.field(self.citing_colname).type
+            self.parquet_vertices = pa.array(self.vertex_names).cast(field_type)
+        vertex_ids = pa.array(self.vertex_ids)
+        for batch in self.parquet_file.iter_batches(
+            batch_size=self.parquet_batch_size, columns=columns
+        ):
+            arrays = []
+            for i in range(2):
+                if batch.column(i).null_count:
+                    raise ValueError("citing/cited ID columns contain missing values")
+                positions = pc.index_in(
+                    batch.column(i), value_set=self.parquet_vertices
+                )
+                if positions.null_count:
+                    missing = pc.filter(batch.column(i), pc.is_null(positions))
+                    raise KeyError(
+                        "node names not found in the vertices: {}".format(
+                            pc.unique(missing).to_pylist()[:10]
+                        )
+                    )
+                arrays.append(pc.take(vertex_ids, positions))
+            if self.weighted:
+                arrays.append(batch.column(2))
+            pacsv.write_csv(
+                pa.RecordBatch.from_arrays(arrays, names=columns),
+                outfile,
+                write_options,
+            )
 
     def get_df_vertices(self):
         """Get a dataframe of unique node names and assinged integer node IDs
 
+        See get_vertices()
+
         Returns
         -------
         Pandas dataframe
 
         """
-        logger.debug("getting vertices dataframe...")
+        self.get_vertices()
+        return self.df_vertices
+
+    def get_vertices(self):
+        """Get arrays of unique node names and assinged integer node IDs
+
+        Both endpoint columns are factorized in a single pass, which also
+        gives the integer node ID of every edge endpoint. These are stored in
+        ``self.edge_ids`` as a (citing_ids, cited_ids) tuple so that
+        ``write()`` does not need to look them up again. Note that these are
+        two int64 arrays over the whole edgelist (16 bytes per edge); write()
+        releases them once it is done.
+
+        Returns
+        -------
+        tuple of (node names, node IDs) numpy arrays
+
+        """
+        logger.debug("getting vertices...")
+        if self.parquet_file is not None:
+            return self._get_vertices_parquet()
+        citing = self.df_edgelist[self.citing_colname]
+        cited = self.df_edgelist[self.cited_colname]
+        if (
+            isinstance(citing.dtype, pd.CategoricalDtype)
+            and citing.dtype == cited.dtype
+        ):
+            # the categories are already the unique node names
+            if citing.isna().any() or cited.isna().any():
+                raise ValueError("citing/cited ID columns contain missing values")
+            categories = citing.cat.categories
+            self._set_vertices(categories.to_numpy(), np.arange(1, len(categories) + 1))
+            self.edge_ids = (
+                citing.cat.codes.to_numpy(dtype=np.int64) + 1,
+                cited.cat.codes.to_numpy(dtype=np.int64) + 1,
+            )
+            return self.vertex_names, self.vertex_ids
+
         x = np.concatenate(
             (
                 self.df_edgelist[self.citing_colname],
@@ -141,98 +413,199 @@ class PajekWriter:
             ),
             axis=0,
         )
-        x = np.unique(x)
-        df_vertices = pd.DataFrame(x, columns=["node_name"])
-        df_vertices["node_id"] = range(1, len(df_vertices) + 1)
-        df_vertices["node_name"] = df_vertices["node_name"].astype(self.dtype)
-        self.df_vertices = df_vertices
-        return self.df_vertices
-
-    def get_id_map(self, df_vertices):
-        """Get a pandas Series mapping node name to assigned integer node ID
+        codes, uniques = pd.factorize(x, sort=self.sort_vertices)
+        if (codes == -1).any():
+            # e.g., NA in a pandas "str" column, which astype(str) keeps as NA
+            raise ValueError("citing/cited ID columns contain missing values")
+        codes += 1  # Pajek node IDs start at 1
+        self._set_vertices(np.asarray(uniques), np.arange(1, len(uniques) + 1))
+        self.edge_ids = (codes[: self.num_edges], codes[self.num_edges :])
+        return self.vertex_names, self.vertex_ids
+
+    def get_id_map(self, df_vertices: Optional[pd.DataFrame] = None):
+        """Get a dict mapping node name to assigned integer node ID
+
+        This is for callers who want the mapping itself. Looking up the IDs
+        of many names is faster with the index from _get_vertex_index(), since
+        ``Series.map()`` turns a dict into a new Series (and hash index) on
+        every call.
 
         Parameters
         ----------
-        df_vertices : Pandas DataFrame
-            dataframe with 'node_name' and 'node_id' columns
+        df_vertices : Pandas DataFrame, optional
+            dataframe with 'node_name' and 'node_id' columns. If None, use
+            self.vertex_names and self.vertex_ids
 
         Returns
         -------
-        Pandas Series
+        dict
 
         """
         logger.debug("getting ID map...")
-        self.id_map = df_vertices.set_index("node_name")["node_id"]
+        if df_vertices is not None:
+            names = df_vertices["node_name"].to_numpy()
+            ids = df_vertices["node_id"].to_numpy()
+        else:
+            names, ids = self.vertex_names, self.vertex_ids
+        self.id_map = dict(zip(names.tolist(), ids.tolist()))
         return self.id_map
 
-    def write(self, outf, chunksize: int = 10000000, on_err: Optional[str] = None):
+    def vertex_names_need_quoting(self):
+        """Check whether any vertex name has to be quoted in the Pajek file
+
+        Names need quotes if they contain whitespace or are empty. Pajek has
+        no way to escape a quote character inside a name, so names containing
+        one raise a ValueError.
+
+        Returns
+        -------
+        bool
+
+        """
+        if pd.api.types.is_integer_dtype(self.vertex_names):
+            return False
+        names = pd.Series(self.vertex_names, copy=False).astype(str)
+        has_quote = names.str.contains('"', regex=False)
+        if has_quote.any():
+            raise ValueError(
+                "vertex names can't contain '\"': {}".format(
+                    names[has_quote].tolist()[:10]
+                )
+            )
+        return bool(names.str.contains(r"\s|^$", regex=True).any())
+
+    def _map_ids(self, names):
+        """Look up integer node IDs for a Series of node names"""
+        index = self._get_vertex_index()
+        if isinstance(names.dtype, pd.CategoricalDtype):
+            # look up each category once, then expand by the codes. the extra
+            # -1 at the end is what a missing value (code -1) picks up
+            positions = np.append(index.get_indexer(names.cat.categories), -1)
+            positions = positions[names.cat.codes.to_numpy()]
+        else:
+            positions = index.get_indexer(names)
+        missing = positions == -1
+        if missing.any():
+            raise KeyError(
+                "node names not found in the vertices: {}".format(
+                    pd.unique(names[missing])[:10].tolist()
+                )
+            )
+        return self.vertex_ids[positions].astype(np.int64, copy=False)
+
+    def iter_edge_ids(self, chunksize: int = 65536):
+        """Iterate over the edgelist in chunks of rows, with integer node IDs
+
+        Only one chunk of IDs is materialized at a time, so the edgelist
+        itself is never modified.
+
+        Parameters
+        ----------
+        chunksize : int
+            number of edges per chunk
+
+        Yields
+        ------
+        tuple of (edgelist chunk, citing IDs, cited IDs)
+
+        """
+        if self.edge_ids is None:
+            self._check_vertex_names_dtype()
+        for start in range(0, self.num_edges, chunksize):
+            chunk = self.df_edgelist.iloc[start : start + chunksize]
+            if self.edge_ids is not None:
+                citing_id = self.edge_ids[0][start : start + chunksize]
+                cited_id = self.edge_ids[1][start : start + chunksize]
+            else:
+                # df_vertices was supplied by the caller, so look the IDs up.
+                # both columns are stacked so they are looked up in a single pass
+                ids = self._map_ids(
+                    pd.concat(
+                        (chunk[self.citing_colname], chunk[self.cited_colname]),
+                        ignore_index=True,
+                    )
+                )
+                citing_id, cited_id = ids[: len(chunk)], ids[len(chunk) :]
+            yield chunk, citing_id, cited_id
+
+    def write(self, outf, chunksize: int = 65536, on_err: Optional[str] = None):
         """Write the network to a Pajek (.net) file
 
         Parameters
         ----------
         outf : str or Path
             path to output file (will be overwritten if exists)
+        chunksize : int, default: 65536
+            number of lines to format and write at a time. Small chunks keep
+            the intermediate formatted strings small
+        on_err : str, optional
+            Deprecated and ignored. write() no longer adds columns to
+            df_edgelist, so there is nothing extra to checkpoint on a
+            MemoryError
 
         """
-        if self.id_map is None:
-            if self.df_vertices is None:
-                self.df_vertices = self.get_df_vertices()
-            self.id_map = self.get_id_map(self.df_vertices)
-        self.df_edgelist["citing_id"] = self.df_edgelist[self.citing_colname].map(
-            self.id_map
-        )
-        self.df_edgelist["cited_id"] = self.df_edgelist[self.cited_colname].map(
-            self.id_map
-        )
+        if on_err is not None:
+            warnings.warn(
+                "the on_err argument to write() is deprecated and has no effect",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        if self.vertex_names is None:
+            self.get_vertices()
+        from pathlib import Path
+
+        # importing numba is slow, so only do it when it might be used
+        if not self.weighted:
+            from ._numba_format import HAS_NUMBA, format_edge_lines
+
         outfpath = Path(outf)
         quotechar = '"'
         logger.debug("opening output file: {}".format(outfpath))
-        with open(outfpath, "w", newline="\n") as outfile:
+        with open(outfpath, "wb", buffering=WRITE_BUFFER_SIZE) as outfile:
             logger.debug("writing {} vertices...".format(self.num_vertices))
-            outfile.write("*{} {}\n".format(self.vertices_label, self.num_vertices))
-            self.df_vertices["node_name"] = (
-                quotechar + self.df_vertices["node_name"].astype(str) + quotechar
-            )
-            self.df_vertices[["node_id", "node_name"]].to_csv(
-                outfile,
-                sep=" ",
-                index=False,
-                header=False,
-                quoting=QUOTE_NONE,
-                line_terminator="\n",
-                chunksize=chunksize,
-                escapechar="\\",
+            outfile.write(
+                "*{} {}\n".format(self.vertices_label, self.num_vertices).encode()
             )
+            # .tolist() gives plain python objects, avoiding numpy scalar boxing
+            ids = self.vertex_ids.tolist()
+            names = self.vertex_names.tolist()
+            if self.vertex_names_need_quoting():
+                line_fmt = "{} " + quotechar + "{}" + quotechar + "\n"
+            else:
+                # quotes are optional in Pajek, and skipping them shrinks the output
+                line_fmt = "{} {}\n"
+            for start in range(0, self.num_vertices, chunksize):
+                lines = "".join(
+                    line_fmt.format(i, n)
+                    for i, n in zip(
+                        ids[start : start + chunksize], names[start : start + chunksize]
+                    )
+                )
+                outfile.write(lines.encode())
 
             logger.debug("writing {} edges...".format(self.num_edges))
-            outfile.write("*{} {}\n".format(self.edges_label, self.num_edges))
+            outfile.write("*{} {}\n".format(self.edges_label, self.num_edges).encode())
 
-            outcols = ["citing_id", "cited_id"]
-            if self.weighted:
-                outcols.append(self.weight_colname)
-            try:
-                self.df_edgelist[outcols].to_csv(
-                    outfile,
-                    sep=" ",
-                    index=False,
-                    header=False,
-                    quoting=QUOTE_NONE,
-                    line_terminator="\n",
-                    chunksize=chunksize,
-                    escapechar="\\",
-                )
-            except MemoryError:
-                if on_err == "ckpt_and_raise":
-                    logger.debug(
-                        "MemoryError encountered. Attempting to save pickle before raising exception."
-                    )
-                    gc.collect()
-                    fpath_ckpt = outfpath.parent.joinpath(
-                        "memerr_edgelist_ckpt_pandas.pickle"
-                    )
-                    logger.debug("saving df_edgelist to {}".format(fpath_ckpt))
-                    self.df_edgelist.to_pickle(fpath_ckpt)
-                raise
+            if self.parquet_file is not None:
+                self._write_edges_parquet(outfile)
+            else:
+                for chunk, citing_id, cited_id in self.iter_edge_ids(chunksize):
+                    if not self.weighted and HAS_NUMBA:
+                        outfile.write(format_edge_lines(citing_id, cited_id))
+                        continue
+                    # build all of the lines for this chunk with vectorized
+                    # string ops and write them at once
+                    cited_str = pd.Series(cited_id).astype(str).to_numpy()
+                    lines = pd.Series(citing_id).astype(str).str.cat(cited_str, sep=" ")
+                    if self.weighted:
+                        lines = lines.str.cat(
+                            chunk[self.weight_colname].astype(str).to_numpy(),
+                            sep=" ",
+                        )
+                    outfile.write(("\n".join(lines) + "\n").encode())
+        # the full-edgelist ID arrays aren't needed any more. a later write()
+        # looks the IDs up chunk by chunk through the vertex index instead
+        self.edge_ids = None
 
 
 def main(args):
@@ -240,10 +613,21 @@ def main(args):
 
 
 if __name__ == "__main__":
+    import sys
+    import argparse
+    from datetime import datetime
+    from timeit import default_timer as timer
+
+    try:
+        from humanfriendly import format_timespan
+    except ImportError:
+
+        def format_timespan(seconds):
+            return "{:.2f} seconds".format(seconds)
+
     total_start = timer()
     logger.info(" ".join(sys.argv))
     logger.info("{:%Y-%m-%d %H:%M:%S}".format(datetime.now()))
-    import argparse
 
     parser = argparse.ArgumentParser(description=DESCRIPTION)
     parser.add_argument("--debug", action="store_true", help="output debugging info")
@@ -16,21 +16,18 @@ except ImportError:
     def format_timespan(seconds):
         return "{:.2f} seconds".format(seconds)
 
-import pandas as pd
 from pajek_tools import PajekWriter
 
 def main(args):
     directed = not args.undirected
     logger.debug("Input network is {}directed".format("" if directed else "not "))
     logger.debug("Using input: {}".format(args.input))
-    start = timer()
-    df = pd.read_parquet(args.input)
-    logger.debug("loading input took {}".format(format_timespan(timer()-start)))
-    if args.citing_colname not in df.columns or args.cited_colname not in df.columns:
-        raise RuntimeError("one of [citing_colname ({}), cited_colname ({})] not in df.columns ({})".format(args.citing_colname, args.cited_colname, df.columns))
+    writer = PajekWriter.from_parquet(args.input, directed=directed, citing_colname=args.citing_colname, cited_colname=args.cited_colname)
+    columns = writer.parquet_file.schema_arrow.names
+    if args.citing_colname not in columns or args.cited_colname not in columns:
+        raise RuntimeError("one of [citing_colname ({}), cited_colname ({})] not in parquet columns ({})".format(args.citing_colname, args.cited_colname, columns))
     logger.debug("writing to output: {}".format(args.output))
     start = timer()
-    writer = PajekWriter(df, directed=directed, citing_colname=args.citing_colname, cited_colname=args.cited_colname)
     writer.write(args.output)
     logger.debug("done writing to file. writing took {}".format(format_timespan(timer()-start)))
 
@@ -38,6 +38,7 @@ setup(
         ],
     },
     install_requires=requirements,
+    extras_require={'parquet': ['pyarrow'], 'numba': ['numba']},
     license="MIT license",
     long_description=readme + '\n\n' + history,
     long_description_content_type='text/x-rst',
@@ -3,9 +3,37 @@
 """Tests for `pajek_tools` package."""
 
 
+import os
+import shlex
+import shutil
+import tempfile
 import unittest
+from unittest import mock
+
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 from pajek_tools import pajek_tools
+from pajek_tools._numba_format import format_edge_lines
+
+
+def read_pajek(fpath):
+    """Parse a Pajek file into (header labels, {id: name}, list of edge rows)"""
+    with open(fpath) as f:
+        lines = f.read().splitlines()
+    vertices_header = lines[0]
+    num_vertices = int(vertices_header.split()[1])
+    vertices = {}
+    for line in lines[1 : num_vertices + 1]:
+        node_id, node_name = shlex.split(line)
+        vertices[int(node_id)] = node_name
+    edges_header = lines[num_vertices + 1]
+    edges = [line.split() for line in lines[num_vertices + 2 :]]
+    return (vertices_header, edges_header), vertices, edges
 
 
 class TestPajek_tools(unittest.TestCase):
@@ -13,9 +41,258 @@ class TestPajek_tools(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures, if any."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.outfpath = os.path.join(self.tmpdir, "out.net")
+        self.df = pd.DataFrame(
+            {
+                "ID": ["a", "b", "c", "a", "d"],
+                "cited_ID": ["b", "c", "a", "c", "a"],
+                "weight": [1.0, 2.5, 3.0, 1.0, 1.0],
+            }
+        )
 
     def tearDown(self):
         """Tear down test fixtures, if any."""
+        shutil.rmtree(self.tmpdir)
 
     def test_000_something(self):
         """Test something."""
+
+    def test_write_unweighted(self):
+        writer = pajek_tools.PajekWriter(self.df.copy())
+        writer.write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(headers, ("*Vertices 4", "*Arcs 5"))
+        self.assertEqual(sorted(vertices.values()), ["a", "b", "c", "d"])
+        self.assertEqual(
+            [(vertices[int(u)], vertices[int(v)]) for u, v in edges],
+            list(zip(self.df["ID"], self.df["cited_ID"])),
+        )
+
+    def test_write_weighted_undirected(self):
+        writer = pajek_tools.PajekWriter(self.df.copy(), weighted=True, directed=False)
+        writer.write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(headers, ("*Vertices 4", "*Edges 5"))
+        self.assertEqual([float(w) for _, _, w in edges], list(self.df["weight"]))
+
+    def test_write_with_given_vertices(self):
+        writer = pajek_tools.PajekWriter(self.df.copy())
+        writer.df_vertices = pd.DataFrame(
+            {"node_name": ["d", "c", "b", "a"], "node_id": [1, 2, 3, 4]}
+        )
+        writer.write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(vertices, {1: "d", 2: "c", 3: "b", 4: "a"})
+        self.assertEqual(edges[0], ["4", "3"])
+
+    def test_write_in_chunks(self):
+        writer = pajek_tools.PajekWriter(self.df.copy(), weighted=True)
+        writer.write(self.outfpath, chunksize=2)
+        pd.testing.assert_frame_equal(writer.df_edgelist, self.df)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(len(edges), 5)
+        self.assertEqual(
+            [(vertices[int(u)], vertices[int(v)]) for u, v, _ in edges],
+            list(zip(self.df["ID"], self.df["cited_ID"])),
+        )
+
+    def test_write_names_with_spaces(self):
+        df = pd.DataFrame({"ID": ["node one", "b"], "cited_ID": ["b", "node one"]})
+        pajek_tools.PajekWriter(df).write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(sorted(vertices.values()), ["b", "node one"])
+        with open(self.outfpath) as f:
+            self.assertEqual(f.read().splitlines()[1], '1 "node one"')
+
+    def test_write_names_without_spaces_unquoted(self):
+        pajek_tools.PajekWriter(self.df.copy()).write(self.outfpath)
+        with open(self.outfpath) as f:
+            self.assertEqual(f.read().splitlines()[1:5], ["1 a", "2 b", "3 c", "4 d"])
+
+    def test_write_category_dtype(self):
+        writer = pajek_tools.PajekWriter(self.df.copy(), dtype="category")
+        writer.write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(headers, ("*Vertices 4", "*Arcs 5"))
+        self.assertEqual(
+            [(vertices[int(u)], vertices[int(v)]) for u, v in edges],
+            list(zip(self.df["ID"], self.df["cited_ID"])),
+        )
+
+    def test_write_sort_vertices(self):
+        df = pd.DataFrame({"ID": ["c", "a"], "cited_ID": ["b", "c"]})
+        pajek_tools.PajekWriter(df, sort_vertices=True).write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(vertices, {1: "a", 2: "b", 3: "c"})
+        self.assertEqual(edges, [["3", "2"], ["1", "3"]])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_write_from_parquet(self):
+        fpath_parquet = os.path.join(self.tmpdir, "edgelist.parquet")
+        self.df.to_parquet(fpath_parquet)
+        writer = pajek_tools.PajekWriter.from_parquet(
+            fpath_parquet, batch_size=2, weighted=True
+        )
+        writer.write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(headers, ("*Vertices 4", "*Arcs 5"))
+        self.assertEqual(
+            [(vertices[int(u)], vertices[int(v)]) for u, v, _ in edges],
+            list(zip(self.df["ID"], self.df["cited_ID"])),
+        )
+        self.assertEqual([float(w) for _, _, w in edges], list(self.df["weight"]))
+
+    def test_write_category_dtype_with_given_vertices(self):
+        writer = pajek_tools.PajekWriter(self.df.copy(), dtype="category")
+        writer.df_vertices = pd.DataFrame(
+            {"node_name": ["d", "c", "b", "a"], "node_id": [1, 2, 3, 4]}
+        )
+        writer.write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(edges[0], ["4", "3"])
+
+    def test_format_edge_lines(self):
+        out = format_edge_lines([1, 10, 123456], [9, 1, 70])
+        self.assertEqual(out.tobytes(), b"1 9\n10 1\n123456 70\n")
+        with self.assertRaises(ValueError):
+            format_edge_lines([1, 0], [2, 3])
+
+    def test_write_unweighted_without_numba(self):
+        with mock.patch("pajek_tools._numba_format.HAS_NUMBA", False):
+            pajek_tools.PajekWriter(self.df.copy()).write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(
+            [(vertices[int(u)], vertices[int(v)]) for u, v in edges],
+            list(zip(self.df["ID"], self.df["cited_ID"])),
+        )
+
+    def test_get_vertices(self):
+        writer = pajek_tools.PajekWriter(self.df.copy())
+        names, ids = writer.get_vertices()
+        self.assertEqual(names.tolist(), ["a", "b", "c", "d"])
+        self.assertEqual(ids.tolist(), [1, 2, 3, 4])
+        self.assertEqual(writer.df_vertices["node_name"].tolist(), names.tolist())
+        self.assertEqual(writer.get_id_map(), {"a": 1, "b": 2, "c": 3, "d": 4})
+
+    def test_write_integer_ids(self):
+        df = pd.DataFrame({"ID": [30, 10, 20], "cited_ID": [10, 20, 30]})
+        writer = pajek_tools.PajekWriter(df)
+        self.assertTrue(pd.api.types.is_integer_dtype(writer.df_edgelist["ID"]))
+        writer.write(self.outfpath)
+        with open(self.outfpath) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[:4], ["*Vertices 3", "1 30", "2 10", "3 20"])
+        self.assertEqual(lines[5:], ["1 2", "2 3", "3 1"])
+
+    def test_write_with_given_vertices_missing_name(self):
+        df = pd.DataFrame({"ID": ["a", "b", "x"], "cited_ID": ["b", "a", "a"]})
+        for weighted in (False, True):
+            writer = pajek_tools.PajekWriter(df.assign(weight=1.0), weighted=weighted)
+            writer.df_vertices = pd.DataFrame(
+                {"node_name": ["a", "b"], "node_id": [1, 2]}
+            )
+            with self.assertRaises(KeyError):
+                writer.write(self.outfpath)
+
+    def test_integer_ids_with_string_vertices(self):
+        df = pd.DataFrame({"ID": [1, 2], "cited_ID": [2, 1]})
+        writer = pajek_tools.PajekWriter(df)
+        writer.df_vertices = pd.DataFrame({"node_name": ["1", "2"], "node_id": [1, 2]})
+        with self.assertRaises(TypeError):
+            writer.write(self.outfpath)
+
+    def test_integer_ids_without_common_integer_dtype(self):
+        df = pd.DataFrame(
+            {
+                "ID": pd.Series([2 ** 63, 1], dtype="uint64"),
+                "cited_ID": pd.Series([1, 2], dtype="int64"),
+            }
+        )
+        with self.assertRaises(TypeError):
+            pajek_tools.PajekWriter(df)
+
+    def test_nullable_integer_ids_with_na(self):
+        df = pd.DataFrame(
+            {"ID": pd.array([1, pd.NA], dtype="Int64"), "cited_ID": [2, 1]}
+        )
+        with self.assertRaises(ValueError):
+            pajek_tools.PajekWriter(df)
+
+    def test_has_dtype_str(self):
+        writer = pajek_tools.PajekWriter(self.df.copy())
+        self.assertTrue(writer._has_dtype(self.df["ID"]))
+        self.assertFalse(writer._has_dtype(pd.Series(["a", 1], dtype=object)))
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_write_from_parquet_with_given_vertices(self):
+        fpath_parquet = os.path.join(self.tmpdir, "edgelist.parquet")
+        self.df.to_parquet(fpath_parquet)
+        writer = pajek_tools.PajekWriter.from_parquet(fpath_parquet, batch_size=2)
+        writer.df_vertices = pd.DataFrame(
+            {"node_name": ["d", "c", "b", "a"], "node_id": [1, 2, 3, 4]}
+        )
+        writer.write(self.outfpath)
+        headers, vertices, edges = read_pajek(self.outfpath)
+        self.assertEqual(
+            edges, [["4", "3"], ["3", "2"], ["2", "4"], ["4", "2"], ["1", "4"]]
+        )
+        writer.df_vertices = pd.DataFrame(
+            {"node_name": ["d", "c", "b"], "node_id": [1, 2, 3]}
+        )
+        with self.assertRaises(KeyError):
+            writer.write(self.outfpath)
+        with self.assertRaises(TypeError):
+            pajek_tools.PajekWriter.from_parquet(fpath_parquet, dtype="str")
+
+    def test_category_dtype_missing_values(self):
+        df = pd.DataFrame({"ID": ["a", None], "cited_ID": ["b", "a"]})
+        with self.assertRaises(ValueError):
+            pajek_tools.PajekWriter(df, dtype="category")
+
+    def test_new_vertices_reset_id_map(self):
+        writer = pajek_tools.PajekWriter(self.df.copy())
+        writer.get_vertices()
+        writer.get_id_map()
+        writer.df_vertices = pd.DataFrame(
+            {"node_name": ["d", "c", "b", "a"], "node_id": [1, 2, 3, 4]}
+        )
+        self.assertIsNone(writer.id_map)
+        self.assertEqual(writer.get_id_map()["a"], 4)
+
+    def test_write_names_with_quotes(self):
+        df = pd.DataFrame({"ID": ['a"b'], "cited_ID": ["c"]})
+        with self.assertRaises(ValueError):
+            pajek_tools.PajekWriter(df).write(self.outfpath)
+
+    def test_write_on_err_deprecated(self):
+        writer = pajek_tools.PajekWriter(self.df.copy())
+        with self.assertWarns(DeprecationWarning) as cm:
+            writer.write(self.outfpath, on_err="ckpt_and_raise")
+        self.assertEqual(cm.filename, __file__)
+
+    def test_missing_ids(self):
+        df = pd.DataFrame({"ID": ["a", None], "cited_ID": ["b", "a"]})
+        for dtype in (None, "str", "category"):
+            with self.assertRaises(ValueError):
+                pajek_tools.PajekWriter(df.copy(), dtype=dtype)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_missing_ids_from_parquet(self):
+        fpath_parquet = os.path.join(self.tmpdir, "edgelist.parquet")
+        pd.DataFrame({"ID": ["a", None], "cited_ID": ["b", "a"]}).to_parquet(
+            fpath_parquet
+        )
+        writer = pajek_tools.PajekWriter.from_parquet(fpath_parquet)
+        with self.assertRaises(ValueError):
+            writer.write(self.outfpath)
+
+    def test_write_releases_edge_ids(self):
+        writer = pajek_tools.PajekWriter(self.df.copy(), weighted=True)
+        writer.write(self.outfpath)
+        self.assertIsNone(writer.edge_ids)
+        with open(self.outfpath) as f:
+            first = f.read()
+        writer.write(self.outfpath)
+        with open(self.outfpath) as f:
+            self.assertEqual(f.read(), first)